@@ -0,0 +1,40 @@
+"""
+Single-pass numeric aggregation used by extract_features in collect.py
+Compiled with numba when it is installed, runs as plain Python otherwise
+"""
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        return lambda f: f
+
+
+@njit(cache=True)
+def aggregate_posts(timestamps, hours, sentiments, scores):
+    """
+    Walk a user's posts once and collect every per-post sum/count
+    Returns: (late_night_count, negative_count, sum_sentiment, sum_score, min_timestamp, max_timestamp)
+    """
+    late_night_count = 0
+    negative_count = 0
+    sum_sentiment = 0.0
+    sum_score = 0
+    min_timestamp = timestamps[0]
+    max_timestamp = timestamps[0]
+
+    for i in range(len(timestamps)):
+        if hours[i] < 6:
+            late_night_count += 1
+        if sentiments[i] < -0.05:
+            negative_count += 1
+        sum_sentiment += sentiments[i]
+        sum_score += scores[i]
+        if timestamps[i] < min_timestamp:
+            min_timestamp = timestamps[i]
+        if timestamps[i] > max_timestamp:
+            max_timestamp = timestamps[i]
+
+    # Plain Python numbers (not NumPy scalars) so round() and JSON output behave as before
+    return (late_night_count, negative_count, float(sum_sentiment), int(sum_score),
+            float(min_timestamp), float(max_timestamp))
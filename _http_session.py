@@ -0,0 +1,64 @@
+"""
+One HTTP session shared by every thread-local PRAW client in collect.py
+Uses httpx over HTTP/2 (one multiplexed connection to oauth.reddit.com) when
+httpx and h2 are installed, and a pooled keep-alive requests.Session otherwise
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import h2  # noqa: F401  (httpx needs it for http2=True)
+    import httpx
+except ImportError:
+    httpx = None
+
+# Connection-specific headers are not allowed over HTTP/2 (RFC 9113 8.2.2),
+# prawcore's token request sends "Connection: close"
+_HOP_BY_HOP_HEADERS = frozenset({'connection', 'keep-alive', 'proxy-connection', 'transfer-encoding', 'upgrade'})
+
+
+class _HTTPXSession:
+    """
+    The parts of the requests.Session interface prawcore uses, backed by httpx
+    Transport errors are re-raised as their requests equivalents so prawcore
+    still retries them
+    """
+
+    def __init__(self, pool_size):
+        self.client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        )
+        self.headers = self.client.headers
+
+    def request(self, method, url, allow_redirects=True, data=None, headers=None, **kwargs):
+        if isinstance(data, list):
+            data = dict(data)  # prawcore's token request sends sorted (key, value) pairs
+        if headers:
+            headers = {k: v for k, v in headers.items() if k.lower() not in _HOP_BY_HOP_HEADERS}
+        try:
+            return self.client.request(method, url, follow_redirects=allow_redirects, data=data,
+                                       headers=headers, **kwargs)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.ReadTimeout(str(e)) from e
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+
+    def close(self):
+        self.client.close()
+
+
+def make_session(pool_size):
+    """
+    Build the shared session, with room for pool_size concurrent requests
+    Returns: object usable as prawcore.Requestor's session argument
+    """
+    if httpx is not None:
+        return _HTTPXSession(pool_size)
+
+    session = requests.Session()
+    # Two hosts: www.reddit.com for tokens and oauth.reddit.com for the API
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    return session
@@ -0,0 +1,65 @@
+"""
+VADER helpers for collect.py: a cached analyzer and the sentiment process pool worker
+The pool forks from a parent that already loaded the analyzer, so workers reuse it
+"""
+
+import os
+import pickle
+
+import numpy as np
+import vaderSentiment.vaderSentiment as vader
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+# Parsed VADER lexicons, pickled so later runs and workers skip the text parsing
+LEXICON_CACHE = 'data/vader_lexicon.pkl'
+_LEXICON_FILES = [os.path.join(os.path.dirname(vader.__file__), name)
+                  for name in ('vader_lexicon.txt', 'emoji_utf8_lexicon.txt')]
+
+_analyzer = None
+
+
+def load_analyzer():
+    """
+    Load this process's SentimentIntensityAnalyzer (also kept for the pool workers)
+    Its state comes from the pickle in LEXICON_CACHE, which is (re)built by a
+    normal constructor call when missing or out of date
+    """
+    global _analyzer
+    source = [(os.stat(path).st_mtime_ns, os.stat(path).st_size) for path in _LEXICON_FILES]
+
+    try:
+        with open(LEXICON_CACHE, 'rb') as f:
+            cached_source, state = pickle.load(f)
+        if cached_source == source:
+            # Restore everything __init__ set, without re-parsing the lexicon files
+            _analyzer = SentimentIntensityAnalyzer.__new__(SentimentIntensityAnalyzer)
+            _analyzer.__dict__.update(state)
+            return _analyzer
+    except Exception:
+        pass  # Missing, unreadable or old-format cache, rebuild it below
+
+    _analyzer = SentimentIntensityAnalyzer()
+    try:
+        tmp_path = LEXICON_CACHE + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((source, _analyzer.__dict__), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, LEXICON_CACHE)
+    except OSError:
+        pass  # Caching is only an optimisation
+
+    return _analyzer
+
+
+def init_worker():
+    # Forked workers inherit the analyzer the parent loaded, only load one if there isn't any
+    if _analyzer is None:
+        load_analyzer()
+
+
+def score_texts(texts):
+    """
+    Score one user's posts
+    Returns: array of VADER compound scores
+    """
+    return np.fromiter((_analyzer.polarity_scores(t)['compound'] for t in texts),
+                       dtype=np.float64, count=len(texts))
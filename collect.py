@@ -5,15 +5,28 @@ One script, easy to understand and run
 """
 
 import praw
+import prawcore
 import json
+import orjson
 import time
+import threading
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, as_completed, FIRST_COMPLETED
 from datetime import datetime, timedelta
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 import hashlib
+import re
+import atexit
+import signal
+import sys
 import numpy as np
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from _features_loop import aggregate_posts
+from _sentiment_worker import load_analyzer, init_worker, score_texts
+from _http_session import make_session
 
 # ============================================================================
 # CONFIGURATION LOADING
@@ -44,12 +57,89 @@ print(f"   Subreddits to search: {len(config['subreddits_to_search'])}")
 # REDDIT CONNECTION
 # ============================================================================
 
+class SharedRateLimiter:
+    """
+    Rate limiter shared by every worker thread
+    Paces requests from Reddit's X-Ratelimit-* headers so the remaining
+    quota is spread evenly over the rest of the window
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.next_request_time = 0.0
+        self.interval = 0.0
+
+    def wait(self):
+        # Reserve the next free slot, then sleep outside the lock
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_request_time)
+            self.next_request_time = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def update(self, headers):
+        if 'x-ratelimit-remaining' not in headers:
+            return
+        remaining = float(headers['x-ratelimit-remaining'])
+        reset = float(headers['x-ratelimit-reset'])
+        with self.lock:
+            if remaining < 1:
+                # Quota used up, nobody goes until the window resets
+                self.interval = 0.0
+                self.next_request_time = time.monotonic() + reset
+            else:
+                self.interval = reset / remaining
+
+
+rate_limiter = SharedRateLimiter()
+
+
+class RateLimitedRequestor(prawcore.Requestor):
+    """
+    PRAW requestor that goes through the shared rate limiter
+    and backs off exponentially on 429 (Too Many Requests)
+    """
+    MAX_RETRIES = 5
+
+    def request(self, *args, **kwargs):
+        for attempt in range(self.MAX_RETRIES):
+            rate_limiter.wait()
+            response = super().request(*args, **kwargs)
+            rate_limiter.update(response.headers)
+            if response.status_code != 429:
+                break
+            time.sleep(2 ** attempt)
+        return response
+
+
+# One persistent connection pool for every thread (HTTP/2 if httpx is installed),
+# so clients reuse warm connections instead of each opening their own
+http_session = make_session(max(config.get('concurrent_subreddit_searches', 16),
+                                settings.get('concurrent_user_fetches', 16)))
+
+_thread_local = threading.local()
+
+
+def get_reddit():
+    """
+    Get the Reddit client for the current thread
+    PRAW is not thread safe, so every worker thread gets its own instance
+    (they all share one rate limiter and one HTTP session)
+    """
+    if not hasattr(_thread_local, 'reddit'):
+        _thread_local.reddit = praw.Reddit(
+            client_id=credentials['client_id'],
+            client_secret=credentials['client_secret'],
+            user_agent=credentials['user_agent'],
+            requestor_class=RateLimitedRequestor,
+            requestor_kwargs={'session': http_session}
+        )
+    return _thread_local.reddit
+
+
 print("\n🔌 Connecting to Reddit API...")
-reddit = praw.Reddit(
-    client_id=credentials['client_id'],
-    client_secret=credentials['client_secret'],
-    user_agent=credentials['user_agent']
-)
+reddit = get_reddit()
 
 # Test connection
 try:
@@ -58,22 +148,64 @@ try:
 except:
     print("✅ Connected successfully")
 
-# Initialize sentiment analyzer
-sentiment_analyzer = SentimentIntensityAnalyzer()
+# Initialize sentiment analyzer (from a pickled cache after the first run; the
+# sentiment pool's forked workers inherit this same analyzer)
+sentiment_analyzer = load_analyzer()
+
+# VADER is pure-Python CPU work, so users are scored in parallel worker processes.
+# The workers are forked right away, before any threads exist. Where fork isn't
+# available (Windows) scoring stays in-process: spawned workers would re-run this script.
+sentiment_pool = None
+if 'fork' in multiprocessing.get_all_start_methods():
+    sentiment_pool = ProcessPoolExecutor(
+        max_workers=settings.get('sentiment_workers', os.cpu_count()),
+        mp_context=multiprocessing.get_context('fork'),
+        initializer=init_worker
+    )
+    sentiment_pool.submit(int).result()  # First task starts every worker process
 
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
+# Mental health subreddits (lowercase) used by the quality check
+MH_SUBS = frozenset({
+    'depression', 'anxiety', 'mentalhealth', 'suicidewatch',
+    'lonely', 'bipolarreddit', 'bpd', 'adhd', 'ocd', 'ptsd',
+    'addiction', 'edanonymous', 'socialanxiety', 'agoraphobia',
+    'panicattack', 'mentalillness', 'therapy', 'traumatoolbox',
+    'mentalhealthsupport', 'anxietyhelp', 'depressionhelp',
+    'healthanxiety', 'cptsd', 'askatherapist', 'stopselfharm',
+    'eating_disorders', 'psychosis', 'schizophrenia', 'dpdr'
+})
+
+# Narrower set behind the mental_health_participation feature
+CORE_MH_SUBS = frozenset({
+    'depression', 'anxiety', 'mentalhealth', 'suicidewatch',
+    'lonely', 'bipolarreddit', 'bpd', 'adhd'
+})
+
+# First-person pronouns as whole whitespace-separated words ("I'm" or "me." don't count).
+# Cases are spelled out instead of re.IGNORECASE, whose Unicode folding would also
+# match words like 'ı' or 'MİNE' that the original lower().split() check never counted
+FIRST_PERSON_RE = re.compile(r'(?<!\S)(?:[iI]|[mM][eEyY]|[mM][iI][nN][eE]|[mM][yY][sS][eE][lL][fF])(?!\S)')
+
+
+def hash_username(username):
+    """
+    Anonymous ID for a username: first 8 bytes of its SHA-256, as 16 hex chars
+    (same value as hexdigest()[:16], without hex-encoding the whole digest)
+    """
+    return hashlib.sha256(username.encode()).digest()[:8].hex()
+
+
 def get_users_from_subreddit(subreddit_name, sort_method, limit):
     """
     Find active users in a subreddit
     Returns: set of anonymous user hashes
     """
-    print(f"\n🔍 Searching r/{subreddit_name} ({sort_method})...")
-    
     try:
-        subreddit = reddit.subreddit(subreddit_name)
+        subreddit = get_reddit().subreddit(subreddit_name)
         users = set()
         
         # Get posts based on sort method
@@ -107,15 +239,12 @@ def get_users_from_subreddit(subreddit_name, sort_method, limit):
                         users.add(comment.author.name)
             except:
                 pass
-            
-            # Small delay to respect rate limits
-            time.sleep(0.1)
         
-        print(f"   Scanned {post_count} posts, found {len(users)} unique users")
+        print(f"🔍 r/{subreddit_name} ({sort_method}): scanned {post_count} posts, found {len(users)} unique users")
         return users
         
     except Exception as e:
-        print(f"   ❌ Error: {e}")
+        print(f"🔍 r/{subreddit_name} ({sort_method}): ❌ Error: {e}")
         return set()
 
 
@@ -126,18 +255,21 @@ def collect_user_posts(username, days_back):
     Note: Username is only used for API access, never stored
     """
     try:
-        user = reddit.redditor(username)
+        user = get_reddit().redditor(username)
         posts = []
         
-        cutoff_date = datetime.now() - timedelta(days=days_back)
+        cutoff_ts = (datetime.now() - timedelta(days=days_back)).timestamp()
+        
+        # Listings come newest first, one page of 100 per request. PRAW only
+        # fetches the next page when we iterate into it, so stopping at the
+        # first item older than the cutoff also stops pagination.
         
         # Collect submissions (posts)
         for submission in user.submissions.new(limit=None):
-            post_date = datetime.fromtimestamp(submission.created_utc)
-            
-            if post_date < cutoff_date:
+            if submission.created_utc < cutoff_ts:
                 break
             
+            post_date = datetime.fromtimestamp(submission.created_utc)
             text = submission.title + " " + (submission.selftext or "")
             
             posts.append({
@@ -147,18 +279,16 @@ def collect_user_posts(username, days_back):
                 'date': post_date.strftime('%Y-%m-%d %H:%M:%S'),
                 'subreddit': submission.subreddit.display_name,
                 'score': submission.score,
-                'num_comments': submission.num_comments
+                'num_comments': submission.num_comments,
+                '_subreddit_lc': submission.subreddit.display_name.lower()
             })
-            
-            time.sleep(0.1)  # Rate limit
         
         # Collect comments
         for comment in user.comments.new(limit=None):
-            comment_date = datetime.fromtimestamp(comment.created_utc)
-            
-            if comment_date < cutoff_date:
+            if comment.created_utc < cutoff_ts:
                 break
             
+            comment_date = datetime.fromtimestamp(comment.created_utc)
             posts.append({
                 'type': 'comment',
                 'text': comment.body,
@@ -166,10 +296,9 @@ def collect_user_posts(username, days_back):
                 'date': comment_date.strftime('%Y-%m-%d %H:%M:%S'),
                 'subreddit': comment.subreddit.display_name,
                 'score': comment.score,
-                'num_comments': 0
+                'num_comments': 0,
+                '_subreddit_lc': comment.subreddit.display_name.lower()
             })
-            
-            time.sleep(0.1)  # Rate limit
         
         # Sort by time
         posts.sort(key=lambda x: x['timestamp'])
@@ -181,6 +310,84 @@ def collect_user_posts(username, days_back):
         return []
 
 
+def build_post_arrays(posts):
+    """
+    Column-wise (structure-of-arrays) copy of what the analysis reads from posts
+    Built once per user, so every metric works on contiguous arrays instead of dicts
+    Posts are expected in time order (as collect_user_posts returns them)
+    Returns: dict of columns ('sent' is added once sentiment has been scored)
+    """
+    post_count = len(posts)
+    return {
+        'ts': np.fromiter((p['timestamp'] for p in posts), dtype=np.float64, count=post_count),
+        'score': np.fromiter((p['score'] for p in posts), dtype=np.int64, count=post_count),
+        'text_len': np.fromiter((len(p['text']) for p in posts), dtype=np.int64, count=post_count),
+        'text': [p['text'] for p in posts],
+        'subreddit': [p['subreddit'] for p in posts],
+        'subreddit_lc': [p['_subreddit_lc'] for p in posts]
+    }
+
+
+def score_sentiment(texts):
+    """
+    Run VADER once per post, on the sentiment process pool when there is one
+    Returns: array of compound scores, shared by every sentiment-based metric
+    """
+    if sentiment_pool is not None:
+        return sentiment_pool.submit(score_texts, texts).result()
+    
+    return np.fromiter((sentiment_analyzer.polarity_scores(t)['compound'] for t in texts),
+                       dtype=np.float64, count=len(texts))
+
+
+def fetch_user(username, days_back):
+    """
+    Collect a user's posts, run the cheap quality checks and, only if those
+    pass, score sentiment (runs on a fetch thread, which just waits while a
+    worker process does the scoring)
+    Returns: (posts, arrays, (pass/fail, reason)) - arrays is None when no posts were found
+    """
+    posts = collect_user_posts(username, days_back)
+    if not posts:
+        return posts, None, (False, "No posts found")
+    
+    arrays = build_post_arrays(posts)
+    passed, reason = check_user_quality_cheap(arrays)
+    if passed:
+        arrays['sent'] = score_sentiment(arrays['text'])
+    
+    return posts, arrays, (passed, reason)
+
+
+def fetch_users_concurrently(usernames, days_back, max_workers):
+    """
+    Fetch (and score) many users at once, keeping at most max_workers in flight
+    Pacing is left to the shared rate limiter
+    Yields: (username, fetch_user result) in completion order
+    """
+    usernames = iter(usernames)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    in_flight = {}
+    
+    try:
+        for username in itertools.islice(usernames, max_workers):
+            in_flight[executor.submit(fetch_user, username, days_back)] = username
+        
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                username = in_flight.pop(future)
+                
+                # Keep the pipeline full before handing the result back
+                for next_username in itertools.islice(usernames, 1):
+                    in_flight[executor.submit(fetch_user, next_username, days_back)] = next_username
+                
+                yield username, future.result()
+    finally:
+        # Stop early (e.g. target reached): drop anything not started yet
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 def calculate_dynamic_window(posting_frequency):
     """
     Calculate dynamic time window based on posting frequency
@@ -196,23 +403,23 @@ def calculate_dynamic_window(posting_frequency):
         return 50
 
 
-def calculate_baseline_stability(posts):
+def calculate_baseline_stability(arrays):
     """
     Calculate stability coefficient by comparing odd vs even post baselines
     Returns: stability_coefficient (0-1)
     """
-    if len(posts) < 20:
-        return 0.0  # Insufficient data for stability check
+    sentiments = arrays['sent']
     
-    # Split posts into odd/even indices
-    odd_posts = [p for i, p in enumerate(posts) if i % 2 == 1]
-    even_posts = [p for i, p in enumerate(posts) if i % 2 == 0]
+    if len(sentiments) < 20:
+        return 0.0  # Insufficient data for stability check
     
-    # Calculate sentiment means for each half
-    odd_sentiment = sum(sentiment_analyzer.polarity_scores(p['text'])['compound'] 
-                       for p in odd_posts) / len(odd_posts)
-    even_sentiment = sum(sentiment_analyzer.polarity_scores(p['text'])['compound'] 
-                        for p in even_posts) / len(even_posts)
+    # Calculate sentiment means for odd/even post indices. Summed left to right
+    # like the original sum()/len (ndarray.mean() sums pairwise, so the last bit
+    # can differ and flip the min_baseline_stability check at the boundary)
+    odd = sentiments[1::2].tolist()
+    even = sentiments[0::2].tolist()
+    odd_sentiment = sum(odd) / len(odd)
+    even_sentiment = sum(even) / len(even)
     
     # Calculate stability (1 - difference between halves)
     stability = 1 - abs(odd_sentiment - even_sentiment)
@@ -220,33 +427,34 @@ def calculate_baseline_stability(posts):
     return max(0, stability)
 
 
-def calculate_z_scores(posts):
+def calculate_z_scores(arrays):
     """
     Calculate z-scores for behavioral metrics to establish personalized baselines
     Z = (current_score - user_mean) / user_std
     """
-    # Extract time-series of metrics
-    sentiments = [sentiment_analyzer.polarity_scores(p['text'])['compound'] for p in posts]
+    # Time-series of metrics
+    sentiments = arrays['sent']
     
     if len(sentiments) < 2:
         return None
     
     # Calculate mean and std for user
-    user_mean = np.mean(sentiments)
-    user_std = np.std(sentiments)
+    user_mean = sentiments.mean()
+    user_std = sentiments.std()
     
     if user_std == 0:
         return None  # Cannot calculate z-scores with zero variance
     
     # Calculate z-scores for each post
-    z_scores = [(s - user_mean) / user_std for s in sentiments]
+    z_scores = (sentiments - user_mean) / user_std
+    abs_z_scores = np.abs(z_scores)
     
     return {
         'user_mean_sentiment': float(user_mean),
         'user_std_sentiment': float(user_std),
-        'max_z_score': float(max(abs(z) for z in z_scores)),
-        'deviations_z_gt_2': sum(1 for z in z_scores if abs(z) > 2),
-        'z_scores_timeline': [float(z) for z in z_scores]  # For temporal analysis
+        'max_z_score': float(abs_z_scores.max()),
+        'deviations_z_gt_2': int((abs_z_scores > 2).sum()),
+        'z_scores_timeline': z_scores.tolist()  # For temporal analysis
     }
 
 
@@ -258,26 +466,22 @@ def calculate_confidence_score(post_count, minimum_reliable_threshold=30):
     return min(1.0, post_count / minimum_reliable_threshold)
 
 
-def calculate_temporal_consistency(posts):
+def calculate_temporal_consistency(arrays):
     """
     Calculate posting consistency over time
     Returns: consistency_score (0-1)
     """
-    timestamps = [p['timestamp'] for p in posts]
+    timestamps = arrays['ts']
     
     if len(timestamps) < 2:
         return 0.0
     
     # Calculate inter-post intervals (in days)
-    intervals = [(timestamps[i+1] - timestamps[i]) / 86400 
-                 for i in range(len(timestamps)-1)]
-    
-    if not intervals:
-        return 0.0
+    intervals = np.diff(timestamps) / 86400
     
     # Calculate coefficient of variation (lower = more consistent)
-    mean_interval = np.mean(intervals)
-    std_interval = np.std(intervals)
+    mean_interval = intervals.mean()
+    std_interval = intervals.std()
     
     if mean_interval == 0:
         return 0.0
@@ -290,59 +494,79 @@ def calculate_temporal_consistency(posts):
     return float(consistency)
 
 
-def check_user_quality(posts):
+def make_quality_checks(settings):
     """
-    Check if user meets quality criteria
-    Returns: (pass/fail, reason)
+    Build the quality checks for this run's settings
+    The settings never change during a run, so they are read once here and the
+    checks use plain local values instead of dict lookups on every candidate
+    Returns: (check_user_quality_cheap, check_user_quality_stability)
     """
-    # Check 1: Minimum post count
-    if len(posts) < settings['min_posts_per_user']:
-        return False, f"Only {len(posts)} posts (need {settings['min_posts_per_user']})"
-    
-    # Check 2: Time span (not all posts in one day)
-    timestamps = [p['timestamp'] for p in posts]
-    time_span_days = (max(timestamps) - min(timestamps)) / 86400
-    
-    if time_span_days < 7:
-        return False, f"All posts within {time_span_days:.1f} days (need 7+ days spread)"
-    
-    # Check 3: Average text length
-    avg_length = sum(len(p['text']) for p in posts) / len(posts)
-    
-    if avg_length < settings['min_text_length']:
-        return False, f"Posts too short (avg {avg_length:.0f} chars)"
-    
-    # Check 4: Subreddit diversity
-    subreddits = set(p['subreddit'] for p in posts)
-    
-    if len(subreddits) < settings['min_subreddits']:
-        return False, f"Only posts in {len(subreddits)} subreddit(s)"
-    
-    # Check 5: Mental health participation (NEW)
-    mental_health_subs = ['depression', 'anxiety', 'mentalhealth', 'suicidewatch', 
-                          'lonely', 'bipolarreddit', 'bpd', 'adhd', 'ocd', 'ptsd',
-                          'addiction', 'edanonymous', 'socialanxiety', 'agoraphobia',
-                          'panicattack', 'mentalillness', 'therapy', 'traumatoolbox',
-                          'mentalhealthsupport', 'anxietyhelp', 'depressionhelp',
-                          'healthanxiety', 'cptsd', 'askatherapist', 'stopselfharm',
-                          'eating_disorders', 'psychosis', 'schizophrenia', 'dpdr']
-    
-    mh_posts = sum(1 for p in posts if p['subreddit'].lower() in mental_health_subs)
-    mh_ratio = mh_posts / len(posts)
-    
-    if 'min_mh_posts' in settings and mh_posts < settings['min_mh_posts']:
-        return False, f"Only {mh_posts} mental health posts (need {settings['min_mh_posts']})"
-    
-    if 'min_mh_participation_ratio' in settings and mh_ratio < settings['min_mh_participation_ratio']:
-        return False, f"Only {mh_ratio:.1%} MH participation (need {settings['min_mh_participation_ratio']:.1%})"
+    min_posts = settings['min_posts_per_user']
+    min_text_length = settings['min_text_length']
+    min_subreddits = settings['min_subreddits']
+    min_mh_posts = settings.get('min_mh_posts')
+    min_mh_ratio = settings.get('min_mh_participation_ratio')
+    min_stability = settings.get('min_baseline_stability')
+    
+    def check_user_quality_cheap(arrays):
+        """
+        Check if user meets the quality criteria that don't need sentiment
+        Runs before any VADER scoring, so rejected users are never scored
+        Returns: (pass/fail, reason)
+        """
+        post_count = len(arrays['ts'])
+        
+        # Check 1: Minimum post count
+        if post_count < min_posts:
+            return False, f"Only {post_count} posts (need {min_posts})"
+        
+        # Check 2: Time span (not all posts in one day), posts are in time order
+        time_span_days = (arrays['ts'][-1] - arrays['ts'][0]) / 86400
+        
+        if time_span_days < 7:
+            return False, f"All posts within {time_span_days:.1f} days (need 7+ days spread)"
+        
+        # Check 3: Average text length
+        avg_length = arrays['text_len'].mean()
+        
+        if avg_length < min_text_length:
+            return False, f"Posts too short (avg {avg_length:.0f} chars)"
+        
+        # Check 4: Subreddit diversity
+        subreddits = set(arrays['subreddit'])
+        
+        if len(subreddits) < min_subreddits:
+            return False, f"Only posts in {len(subreddits)} subreddit(s)"
+        
+        # Check 5: Mental health participation (NEW)
+        mh_posts = sum(map(MH_SUBS.__contains__, arrays['subreddit_lc']))  # Counted in C, no Python loop
+        mh_ratio = mh_posts / post_count
+        
+        if min_mh_posts is not None and mh_posts < min_mh_posts:
+            return False, f"Only {mh_posts} mental health posts (need {min_mh_posts})"
+        
+        if min_mh_ratio is not None and mh_ratio < min_mh_ratio:
+            return False, f"Only {mh_ratio:.1%} MH participation (need {min_mh_ratio:.1%})"
+        
+        return True, "Passed all checks"
     
-    # Check 6: Baseline stability (for users with enough posts)
-    if len(posts) >= 20 and 'min_baseline_stability' in settings:
-        baseline_stability = calculate_baseline_stability(posts)
-        if baseline_stability < settings['min_baseline_stability']:
-            return False, f"Low baseline stability ({baseline_stability:.2f}, need {settings['min_baseline_stability']:.2f})"
+    def check_user_quality_stability(arrays):
+        """
+        Check 6: Baseline stability (for users with enough posts)
+        Needs the scored sentiment column, so it runs after check_user_quality_cheap
+        Returns: (pass/fail, reason)
+        """
+        if min_stability is not None and len(arrays['sent']) >= 20:
+            baseline_stability = calculate_baseline_stability(arrays)
+            if baseline_stability < min_stability:
+                return False, f"Low baseline stability ({baseline_stability:.2f}, need {min_stability:.2f})"
+        
+        return True, "Passed all checks"
     
-    return True, "Passed all checks"
+    return check_user_quality_cheap, check_user_quality_stability
+
+
+check_user_quality_cheap, check_user_quality_stability = make_quality_checks(settings)
 
 
 def send_email_notification(milestone, total_users, avg_posts, avg_sentiment, time_elapsed):
@@ -434,51 +658,53 @@ def send_email_notification(milestone, total_users, avg_posts, avg_sentiment, ti
         print(f"   ⚠️  Failed to send email notification: {e}")
 
 
-def extract_features(posts):
+def extract_features(arrays):
     """
     Extract features needed for your model
     Returns: dictionary of features
     """
-    # Temporal features
-    timestamps = [p['timestamp'] for p in posts]
-    time_span_days = (max(timestamps) - min(timestamps)) / 86400
-    posting_frequency = len(posts) / time_span_days
+    post_count = len(arrays['ts'])
     
-    # Get posting hours
-    hours = [datetime.fromtimestamp(ts).hour for ts in timestamps]
-    late_night_posts = sum(1 for h in hours if 0 <= h < 6)
-    late_night_ratio = late_night_posts / len(posts)
+    # Local posting hour straight from the timestamps, no datetime per post
+    # (uses the current UTC offset for every post)
+    utc_offset = time.localtime().tm_gmtoff
+    hours = ((arrays['ts'] + utc_offset) // 3600 % 24).astype(np.int64)
+    
+    # Per-post numeric columns, aggregated in a single pass
+    (late_night_posts, negative_posts, sum_sentiment, sum_score,
+     min_timestamp, max_timestamp) = aggregate_posts(arrays['ts'], hours, arrays['sent'], arrays['score'])
+    
+    # Temporal features
+    time_span_days = (max_timestamp - min_timestamp) / 86400
+    posting_frequency = post_count / time_span_days
+    late_night_ratio = late_night_posts / post_count
     
     # Sentiment analysis
-    sentiments = [sentiment_analyzer.polarity_scores(p['text']) for p in posts]
-    avg_sentiment = sum(s['compound'] for s in sentiments) / len(sentiments)
-    negative_posts = sum(1 for s in sentiments if s['compound'] < -0.05)
-    negative_ratio = negative_posts / len(posts)
+    avg_sentiment = sum_sentiment / post_count
+    negative_ratio = negative_posts / post_count
     
-    # Linguistic features
-    all_text = ' '.join(p['text'] for p in posts).lower()
-    words = all_text.split()
+    # Linguistic features: first-person pronouns (depression indicator)
+    first_person_count = 0
+    total_words = 0
+    for text in arrays['text']:
+        first_person_count += len(FIRST_PERSON_RE.findall(text))
+        total_words += len(text.split())
     
-    # First-person pronouns (depression indicator)
-    first_person_count = sum(1 for w in words if w in ['i', 'me', 'my', 'mine', 'myself'])
-    first_person_ratio = first_person_count / len(words) if words else 0
+    first_person_ratio = first_person_count / total_words if total_words else 0
     
     # Engagement features
-    avg_score = sum(p['score'] for p in posts) / len(posts)
+    avg_score = sum_score / post_count
     
     # Community features
-    subreddits = [p['subreddit'] for p in posts]
-    unique_subreddits = len(set(subreddits))
+    unique_subreddits = len(set(arrays['subreddit']))
     
-    mental_health_subs = ['depression', 'anxiety', 'mentalhealth', 'suicidewatch', 
-                          'lonely', 'bipolarreddit', 'bpd', 'adhd']
-    mh_posts = sum(1 for s in subreddits if s.lower() in mental_health_subs)
-    mh_ratio = mh_posts / len(posts)
+    mh_posts = sum(map(CORE_MH_SUBS.__contains__, arrays['subreddit_lc']))
+    mh_ratio = mh_posts / post_count
     
     # Calculate cold start features
-    confidence_score = calculate_confidence_score(len(posts))
-    temporal_consistency = calculate_temporal_consistency(posts)
-    baseline_stability = calculate_baseline_stability(posts) if len(posts) >= 20 else 0.0
+    confidence_score = calculate_confidence_score(post_count)
+    temporal_consistency = calculate_temporal_consistency(arrays)
+    baseline_stability = calculate_baseline_stability(arrays) if post_count >= 20 else 0.0
     
     # Determine cold start phase
     if confidence_score < 0.33:
@@ -489,7 +715,7 @@ def extract_features(posts):
         cold_start_phase = 'fully_personalized'
     
     features = {
-        'total_posts': len(posts),
+        'total_posts': post_count,
         'time_span_days': round(time_span_days, 2),
         'posting_frequency': round(posting_frequency, 2),
         'late_night_ratio': round(late_night_ratio, 3),
@@ -507,7 +733,7 @@ def extract_features(posts):
     }
     
     # Add z-score features if available
-    z_score_features = calculate_z_scores(posts)
+    z_score_features = calculate_z_scores(arrays)
     if z_score_features:
         features['user_mean_sentiment'] = round(z_score_features['user_mean_sentiment'], 3)
         features['user_std_sentiment'] = round(z_score_features['user_std_sentiment'], 3)
@@ -517,6 +743,93 @@ def extract_features(posts):
     return features
 
 
+def read_collected_users(path='data/collected_users.jsonl'):
+    """
+    Stream the users saved so far (one JSON object per line)
+    Blank lines and records cut off by an interrupted write are skipped
+    """
+    with open(path, 'rb') as f:
+        for line in f:
+            try:
+                yield orjson.loads(line)
+            except orjson.JSONDecodeError:
+                pass
+
+
+def read_last_user(path='data/collected_users.jsonl'):
+    """
+    Last complete record in the NDJSON file, read from the end of the file
+    Returns: user dictionary, or None if there is none
+    """
+    with open(path, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        block = 64 * 1024
+        while True:
+            start = max(0, size - block)
+            f.seek(start)
+            lines = f.read().split(b'\n')
+            if start > 0:
+                lines = lines[1:]  # Probably starts mid-record
+            for line in reversed(lines):
+                try:
+                    return orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    pass
+            if start == 0:
+                return None
+            block *= 2
+
+
+def user_number(user):
+    """Numeric part of a saved user_id ('user_0042' -> 42)"""
+    return int(user['user_id'].rsplit('_', 1)[1])
+
+
+def open_for_append(path):
+    """
+    Open a one-record-per-line file for buffered appending
+    If an interrupted write left a cut-off last line, new records start on a fresh line
+    """
+    f = open(path, 'ab', buffering=64 * 1024)
+    if f.tell() > 0:
+        with open(path, 'rb') as existing:
+            existing.seek(-1, os.SEEK_END)
+            if existing.read(1) != b'\n':
+                f.write(b'\n')
+    return f
+
+
+def compute_summary_stats(collected_users):
+    """
+    Dataset and cold start statistics for the final summary
+    Computed once and shared by the terminal output and the log file
+    Returns: dictionary of statistics (collected_users must not be empty)
+    """
+    user_count = len(collected_users)
+    features = [u['features'] for u in collected_users]
+    metadata = [u['cold_start_metadata'] for u in collected_users]
+    
+    def mean_of(rows, key):
+        return float(np.fromiter((r[key] for r in rows), dtype=np.float64, count=user_count).mean())
+    
+    phases = [m['cold_start_phase'] for m in metadata]
+    total_posts = sum(f['total_posts'] for f in features)
+    
+    return {
+        'total_posts': total_posts,
+        'avg_posts': total_posts / user_count,
+        'avg_sentiment': mean_of(features, 'avg_sentiment'),
+        'avg_mh_participation': mean_of(features, 'mental_health_participation'),
+        'cold_start_users': phases.count('cold_start'),
+        'transition_users': phases.count('transition'),
+        'full_users': phases.count('fully_personalized'),
+        'avg_confidence': mean_of(metadata, 'confidence_score'),
+        'avg_stability': mean_of(metadata, 'baseline_stability'),
+        'suitable_for_cold_start': sum(1 for m in metadata if m['suitable_for_cold_start_testing']),
+        'suitable_for_baseline': sum(1 for m in metadata if m['suitable_for_baseline_testing'])
+    }
+
+
 # ============================================================================
 # MAIN COLLECTION LOOP
 # ============================================================================
@@ -539,33 +852,76 @@ category_counts = {
     'full_personalization': 0
 }
 
-# Try to load existing data
-try:
-    with open('data/collected_users.json', 'r') as f:
-        collected_users = json.load(f)
-    print(f"\n📂 Found existing data: {len(collected_users)} users already collected")
-except:
+# Try to load existing data. Only the username hashes are needed up front, and
+# they are kept in a small sidecar file (one per line) next to the NDJSON data.
+# The full records are read once, at the end, for the summary.
+already_collected = set()
+last_user_number = 0  # Highest user_id number saved so far
+
+if not os.path.exists('data/collected_users.jsonl') and os.path.exists('data/collected_users.json'):
+    # Runs from before the switch to NDJSON saved a single JSON array
+    with open('data/collected_users.json', 'rb') as f:
+        legacy_users = orjson.loads(f.read())
+    # Written aside and swapped in, so an interrupted conversion is simply redone
+    with open('data/collected_users.jsonl.tmp', 'wb') as f:
+        f.writelines(orjson.dumps(u) + b'\n' for u in legacy_users)
+    os.replace('data/collected_users.jsonl.tmp', 'data/collected_users.jsonl')
+    del legacy_users
+
+if os.path.exists('data/collected_users.jsonl'):
+    # Checkpoints write the records before their hashes, so a sidecar that is
+    # older than the data means a run died in between (or the sidecar is missing)
+    try:
+        sidecar_current = (os.stat('data/collected_hashes.txt').st_mtime_ns
+                           >= os.stat('data/collected_users.jsonl').st_mtime_ns)
+    except FileNotFoundError:
+        sidecar_current = False
+    
+    if sidecar_current:
+        with open('data/collected_hashes.txt', 'r') as f:
+            already_collected = set(f.read().split())
+        # user_ids are handed out in increasing order, so the last record has the highest
+        last_user = read_last_user()
+        if last_user is not None:
+            last_user_number = user_number(last_user)
+    else:
+        # Rebuild the sidecar from the full records
+        for u in read_collected_users():
+            already_collected.add(u['username_hash'])
+            last_user_number = max(last_user_number, user_number(u))
+        # Swapped in whole: a partly written sidecar would look newer than the data
+        with open('data/collected_hashes.txt.tmp', 'w') as f:
+            f.writelines(h + '\n' for h in already_collected)
+        os.replace('data/collected_hashes.txt.tmp', 'data/collected_hashes.txt')
+elif os.path.exists('data/collected_hashes.txt'):
+    os.remove('data/collected_hashes.txt')  # Hashes without data would only block those users
+
+if already_collected:
+    print(f"\n📂 Found existing data: {len(already_collected)} users already collected")
+else:
     print("\n📂 No existing data found, starting fresh")
 
+# Users collected so far, across runs (collected_users only holds this run's)
+total_collected = len(already_collected)
+
 # Discover candidate users
 print("\n--- PHASE 1: DISCOVERING CANDIDATES ---")
 all_candidates = set()
 
-for subreddit in config['subreddits_to_search']:
-    for sort_method in config['sort_methods']:
-        users = get_users_from_subreddit(
-            subreddit, 
-            sort_method, 
-            config['posts_to_scan_per_subreddit']
-        )
-        all_candidates.update(users)
-        
-        time.sleep(2)  # Be nice to Reddit
+# Search every (subreddit, sort) pair in parallel, pacing is left to the shared rate limiter
+searches = itertools.product(config['subreddits_to_search'], config['sort_methods'])
+
+with ThreadPoolExecutor(max_workers=config.get('concurrent_subreddit_searches', 16)) as executor:
+    futures = [
+        executor.submit(get_users_from_subreddit, subreddit, sort_method,
+                        config['posts_to_scan_per_subreddit'])
+        for subreddit, sort_method in searches
+    ]
+    for future in as_completed(futures):
+        all_candidates.update(future.result())
 
 # Remove already collected users
-already_collected = {u['username_hash'] for u in collected_users}
-candidates_to_check = [u for u in all_candidates 
-                      if hashlib.sha256(u.encode()).hexdigest()[:16] not in already_collected]
+candidates_to_check = [u for u in all_candidates if hash_username(u) not in already_collected]
 
 print(f"\n📊 Discovery complete:")
 print(f"   Found: {len(all_candidates)} total candidates")
@@ -576,141 +932,205 @@ print(f"   New to check: {len(candidates_to_check)} users")
 print("\n--- PHASE 2: COLLECTING USER DATA ---")
 print(f"Target: {settings['target_users']} users\n")
 
-for username in candidates_to_check:
-    # Stop if we hit target
-    if len(collected_users) >= settings['target_users']:
-        print(f"\n🎯 Target reached! Collected {len(collected_users)} users")
-        break
-    
-    candidates_checked += 1
-    # Generate anonymous ID immediately
-    username_hash = hashlib.sha256(username.encode()).hexdigest()[:16]
-    temp_user_id = f"candidate_{candidates_checked}"
-    print(f"[{candidates_checked}] Checking: {temp_user_id}")
-    
-    # Collect posts
-    posts = collect_user_posts(username, settings['time_window_days'])
-    
-    if not posts:
-        print(f"   ⏭️  No posts found, skipping")
-        candidates_rejected += 1
-        continue
-    
-    # Quality check
-    passed, reason = check_user_quality(posts)
-    
-    if not passed:
-        print(f"   ⏭️  {reason}")
-        candidates_rejected += 1
-        continue
-    
-    # Extract features
-    features = extract_features(posts)
-    
-    # Determine category based on post count for stratified sampling
-    post_count = len(posts)
-    if 'user_categories' in settings:
-        if post_count < settings['user_categories']['transition']['min']:
-            category = 'cold_start'
-        elif post_count < settings['user_categories']['full_personalization']['min']:
-            category = 'transition'
-        else:
-            category = 'full_personalization'
+# Each collected user is appended as one line (and its hash to the sidecar),
+# nothing is ever rewritten. New users are held in memory and written every
+# CHECKPOINT_EVERY users (and on exit): records first, then their hashes, so
+# the sidecar can never list a user whose record isn't on disk
+CHECKPOINT_EVERY = 10
+hashes_file = open_for_append('data/collected_hashes.txt')
+collected_file = open_for_append('data/collected_users.jsonl')
+pending_records = []
+pending_hashes = []
+
+
+def write_checkpoint():
+    if collected_file.closed:
+        return
+    # Take the batch before writing it: if SIGTERM or Ctrl+C interrupts the writes,
+    # the exit-time checkpoint must not write the same users a second time
+    records, pending_records[:] = pending_records[:], []
+    hashes, pending_hashes[:] = pending_hashes[:], []
+    collected_file.writelines(records)
+    collected_file.flush()
+    hashes_file.writelines(hashes)
+    hashes_file.flush()
+
+
+atexit.register(hashes_file.close)
+atexit.register(collected_file.close)
+atexit.register(write_checkpoint)  # atexit runs in reverse: checkpoint first, then close
+
+# systemd stops the service with SIGTERM; exit normally so the loop's finally still runs
+signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
+
+user_fetches = fetch_users_concurrently(
+    candidates_to_check,
+    settings['time_window_days'],
+    settings.get('concurrent_user_fetches', 16)
+)
+
+# Save and stop the fetches here rather than only at exit: the interpreter joins
+# busy fetch threads before atexit runs, which can outlast systemd's stop timeout
+try:
+    for username, (posts, arrays, cheap_check) in user_fetches:
+        # Stop if we hit target
+        if total_collected >= settings['target_users']:
+            print(f"\n🎯 Target reached! Collected {total_collected} users")
+            break
         
-        # Check if category is full
-        target_per_category = {
-            'cold_start': settings['user_categories']['cold_start']['target_users'],
-            'transition': settings['user_categories']['transition']['target_users'],
-            'full_personalization': settings['user_categories']['full_personalization']['target_users']
-        }
+        candidates_checked += 1
+        # Generate anonymous ID immediately
+        username_hash = hash_username(username)
+        temp_user_id = f"candidate_{candidates_checked}"
+        print(f"[{candidates_checked}] Checking: {temp_user_id}")
         
-        if category_counts[category] >= target_per_category[category]:
-            print(f"   ⏭️  Category '{category}' full ({category_counts[category]}/{target_per_category[category]}), skipping")
+        if not posts:
+            print(f"   ⏭️  No posts found, skipping")
             candidates_rejected += 1
             continue
-    
-    # Calculate baseline stability for metadata
-    baseline_stability = calculate_baseline_stability(posts) if len(posts) >= 20 else 0.0
-    
-    # Use already generated anonymous ID
-    user_id = f"user_{len(collected_users)+1:04d}"
-    
-    # Save user data with cold start metadata
-    user_data = {
-        'user_id': user_id,
-        'username_hash': username_hash,
-        'collection_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        'posts': posts,
-        'features': features,
-        'cold_start_metadata': {
-            'post_count': len(posts),
-            'confidence_score': features.get('confidence_score', 0),
-            'cold_start_phase': features.get('cold_start_phase', 'unknown'),
-            'baseline_stability': round(baseline_stability, 3),
-            'temporal_consistency': features.get('temporal_consistency', 0),
-            'suitable_for_cold_start_testing': len(posts) < 30,
-            'suitable_for_baseline_testing': len(posts) >= 30 and baseline_stability > 0.85,
-            'category': category if 'user_categories' in settings else 'unknown'
+        
+        # Quality check: the cheap checks already ran on the fetch thread,
+        # sentiment was only scored (and stability is only checked) if they passed
+        passed, reason = cheap_check
+        if passed:
+            passed, reason = check_user_quality_stability(arrays)
+        
+        if not passed:
+            print(f"   ⏭️  {reason}")
+            candidates_rejected += 1
+            continue
+        
+        # Extract features
+        features = extract_features(arrays)
+        
+        # Determine category based on post count for stratified sampling
+        post_count = len(posts)
+        if 'user_categories' in settings:
+            if post_count < settings['user_categories']['transition']['min']:
+                category = 'cold_start'
+            elif post_count < settings['user_categories']['full_personalization']['min']:
+                category = 'transition'
+            else:
+                category = 'full_personalization'
+            
+            # Check if category is full
+            target_per_category = {
+                'cold_start': settings['user_categories']['cold_start']['target_users'],
+                'transition': settings['user_categories']['transition']['target_users'],
+                'full_personalization': settings['user_categories']['full_personalization']['target_users']
+            }
+            
+            if category_counts[category] >= target_per_category[category]:
+                print(f"   ⏭️  Category '{category}' full ({category_counts[category]}/{target_per_category[category]}), skipping")
+                candidates_rejected += 1
+                continue
+        
+        # Calculate baseline stability for metadata
+        baseline_stability = calculate_baseline_stability(arrays) if len(posts) >= 20 else 0.0
+        
+        # Use already generated anonymous ID
+        last_user_number += 1
+        user_id = f"user_{last_user_number:04d}"
+        
+        # Save user data with cold start metadata
+        user_data = {
+            'user_id': user_id,
+            'username_hash': username_hash,
+            'collection_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            # Cached analysis fields (e.g. _subreddit_lc) are not part of the saved posts
+            'posts': [{k: v for k, v in p.items() if not k.startswith('_')} for p in posts],
+            'features': features,
+            'cold_start_metadata': {
+                'post_count': len(posts),
+                'confidence_score': features.get('confidence_score', 0),
+                'cold_start_phase': features.get('cold_start_phase', 'unknown'),
+                'baseline_stability': round(baseline_stability, 3),
+                'temporal_consistency': features.get('temporal_consistency', 0),
+                'suitable_for_cold_start_testing': len(posts) < 30,
+                'suitable_for_baseline_testing': len(posts) >= 30 and baseline_stability > 0.85,
+                'category': category if 'user_categories' in settings else 'unknown'
+            }
         }
-    }
-    
-    collected_users.append(user_data)
-    
-    # Increment category count
-    if 'user_categories' in settings:
-        category_counts[category] += 1
-    
-    print(f"   ✅ COLLECTED! ({len(posts)} posts, {category if 'user_categories' in settings else 'N/A'}) - Total: {len(collected_users)}/{settings['target_users']}")
+        
+        collected_users.append(user_data)
+        total_collected += 1
+        
+        # Increment category count
+        if 'user_categories' in settings:
+            category_counts[category] += 1
+        
+        print(f"   ✅ COLLECTED! ({len(posts)} posts, {category if 'user_categories' in settings else 'N/A'}) - Total: {total_collected}/{settings['target_users']}")
 
-    
-    # Save after each user (in case of interruption)
-    with open('data/collected_users.json', 'w') as f:
-        json.dump(collected_users, f, indent=2)
-    
-    # Send email notification every 100 users
-    if len(collected_users) % 100 == 0:
-        total_posts = sum(u['features']['total_posts'] for u in collected_users)
-        avg_posts = total_posts / len(collected_users)
-        avg_sentiment = sum(u['features']['avg_sentiment'] for u in collected_users) / len(collected_users)
-        time_elapsed = time.time() - start_time
         
-        send_email_notification(
-            milestone=len(collected_users),
-            total_users=len(collected_users),
-            avg_posts=avg_posts,
-            avg_sentiment=avg_sentiment,
-            time_elapsed=time_elapsed
-        )
-    
-    # Rate limiting
-    time.sleep(2)
+        # Checkpoint every CHECKPOINT_EVERY users (in case of interruption)
+        pending_records.append(orjson.dumps(user_data) + b'\n')
+        pending_hashes.append(username_hash.encode() + b'\n')
+        if len(pending_records) >= CHECKPOINT_EVERY:
+            write_checkpoint()
+        
+        # Send email notification every 100 users (averages cover this run's users)
+        if total_collected % 100 == 0:
+            total_posts = sum(u['features']['total_posts'] for u in collected_users)
+            avg_posts = total_posts / len(collected_users)
+            avg_sentiment = sum(u['features']['avg_sentiment'] for u in collected_users) / len(collected_users)
+            time_elapsed = time.time() - start_time
+            
+            send_email_notification(
+                milestone=total_collected,
+                total_users=total_collected,
+                avg_posts=avg_posts,
+                avg_sentiment=avg_sentiment,
+                time_elapsed=time_elapsed
+            )
+finally:
+    write_checkpoint()
+    user_fetches.close()  # Cancels the queued fetches
+    collected_file.close()
+    hashes_file.close()
+
+if sentiment_pool is not None:
+    sentiment_pool.shutdown()
+http_session.close()
+
+# Every user collected so far, including earlier runs, for the summary
+collected_users = list(read_collected_users())
+
+# Consolidated single-array copy for tools that expect one JSON document
+with open('data/collected_users.json', 'wb') as f:
+    f.write(orjson.dumps(collected_users))
 
 # ============================================================================
 # FINAL SUMMARY
 # ============================================================================
 
-print("\n" + "="*70)
-print("📊 COLLECTION COMPLETE")
-print("="*70)
-print(f"\n✅ Successfully collected: {len(collected_users)} users")
-print(f"📊 Candidates checked: {candidates_checked}")
-print(f"❌ Candidates rejected: {candidates_rejected}")
-print(f"✓ Success rate: {len(collected_users)/max(candidates_checked,1)*100:.1f}%")
+# Every summary line is built once: printed here and written to the log file at the end
+summary_lines = [
+    "\n" + "="*70 + "\n",
+    "📊 COLLECTION COMPLETE\n",
+    "="*70 + "\n",
+    f"\n✅ Successfully collected: {len(collected_users)} users\n",
+    f"📊 Candidates checked: {candidates_checked}\n",
+    f"❌ Candidates rejected: {candidates_rejected}\n",
+    f"✓ Success rate: {len(collected_users)/max(candidates_checked,1)*100:.1f}%\n"
+]
+dataset_lines = []
+time_lines = []
+cold_start_lines = []
 
 # Calculate statistics
 if collected_users:
-    total_posts = sum(u['features']['total_posts'] for u in collected_users)
-    avg_posts = total_posts / len(collected_users)
-    avg_sentiment = sum(u['features']['avg_sentiment'] for u in collected_users) / len(collected_users)
-    avg_mh_participation = sum(u['features']['mental_health_participation'] for u in collected_users) / len(collected_users)
-    
-    print(f"\n📈 Dataset Statistics:")
-    print(f"   Total posts collected: {total_posts}")
-    print(f"   Average posts per user: {avg_posts:.1f}")
-    print(f"   Average sentiment: {avg_sentiment:.3f}")
-    print(f"   Average MH subreddit participation: {avg_mh_participation:.1%}")
+    stats = compute_summary_stats(collected_users)
+    
+    dataset_lines = [
+        f"\n📈 Dataset Statistics:\n",
+        f"   Total posts collected: {stats['total_posts']}\n",
+        f"   Average posts per user: {stats['avg_posts']:.1f}\n",
+        f"   Average sentiment: {stats['avg_sentiment']:.3f}\n",
+        f"   Average MH subreddit participation: {stats['avg_mh_participation']:.1%}\n"
+    ]
 
-print(f"\n💾 Data saved to: data/collected_users.json")
+print(''.join(summary_lines + dataset_lines), end='')
+print(f"\n💾 Data saved to: data/collected_users.jsonl (and data/collected_users.json)")
 
 # Calculate population baseline for cold start analysis
 if collected_users:
@@ -739,8 +1159,9 @@ if collected_users:
         return population_baseline
     
     population_baseline = calculate_population_baseline(collected_users)
-    with open('data/population_baseline.json', 'w', encoding='utf-8') as f:
-        json.dump(population_baseline, f, indent=2)
+    with open('data/population_baseline.json', 'wb') as f:
+        f.write(orjson.dumps(population_baseline,
+                             option=orjson.OPT_INDENT_2 if settings.get('pretty_json') else 0))
     print("💾 Population baseline saved to: data/population_baseline.json")
 
 # Calculate total time
@@ -749,87 +1170,34 @@ hours = int(total_time // 3600)
 minutes = int((total_time % 3600) // 60)
 seconds = int(total_time % 60)
 
-print("\n⏱️ Collection Time Statistics:")
-print(f"   Total time: {hours}h {minutes}m {seconds}s")
-print(f"   Average time per user: {total_time/len(collected_users):.1f} seconds")
-print(f"   Posts collected per hour: {(total_posts/(total_time/3600)):.1f}")
-
-# Cold start analysis statistics
 if collected_users:
-    cold_start_users = sum(1 for u in collected_users 
-                          if u['cold_start_metadata']['cold_start_phase'] == 'cold_start')
-    transition_users = sum(1 for u in collected_users 
-                          if u['cold_start_metadata']['cold_start_phase'] == 'transition')
-    full_users = sum(1 for u in collected_users 
-                    if u['cold_start_metadata']['cold_start_phase'] == 'fully_personalized')
-    
-    avg_confidence = sum(u['cold_start_metadata']['confidence_score'] 
-                        for u in collected_users) / len(collected_users)
-    
-    avg_stability = sum(u['cold_start_metadata']['baseline_stability'] 
-                       for u in collected_users) / len(collected_users)
-    
-    suitable_for_cold_start = sum(1 for u in collected_users 
-                                  if u['cold_start_metadata']['suitable_for_cold_start_testing'])
-    
-    suitable_for_baseline = sum(1 for u in collected_users 
-                               if u['cold_start_metadata']['suitable_for_baseline_testing'])
-    
-    print("\n🔬 Cold Start Analysis Statistics:")
-    print(f"   Cold start users (5-15 posts): {cold_start_users}")
-    print(f"   Transition users (16-30 posts): {transition_users}")
-    print(f"   Fully personalized users (31+ posts): {full_users}")
-    print(f"   Average confidence score: {avg_confidence:.3f}")
-    print(f"   Average baseline stability: {avg_stability:.3f}")
-    print(f"   Users suitable for cold start testing: {suitable_for_cold_start}")
-    print(f"   Users suitable for baseline testing: {suitable_for_baseline}")
-
-# write all the print statements to a log file
+    time_lines = [
+        f"\n⏱️ Collection Time Statistics:\n",
+        f"   Total time: {hours}h {minutes}m {seconds}s\n",
+        f"   Average time per user: {total_time/len(collected_users):.1f} seconds\n",
+        f"   Posts collected per hour: {(stats['total_posts']/(total_time/3600)):.1f}\n"
+    ]
+    
+    # Cold start analysis statistics
+    cold_start_lines = [
+        f"\n🔬 Cold Start Analysis Statistics:\n",
+        f"   Cold start users (5-15 posts): {stats['cold_start_users']}\n",
+        f"   Transition users (16-30 posts): {stats['transition_users']}\n",
+        f"   Fully personalized users (31+ posts): {stats['full_users']}\n",
+        f"   Average confidence score: {stats['avg_confidence']:.3f}\n",
+        f"   Average baseline stability: {stats['avg_stability']:.3f}\n",
+        f"   Users suitable for cold start testing: {stats['suitable_for_cold_start']}\n",
+        f"   Users suitable for baseline testing: {stats['suitable_for_baseline']}\n"
+    ]
+    
+    print(''.join(time_lines + cold_start_lines), end='')
+
+# Write all the summary lines to a log file
+log_lines = summary_lines + dataset_lines + time_lines + cold_start_lines
+if not collected_users:
+    log_lines.append("\nNo users were collected.\n")
+
 with open('data/collection_log.txt', 'w', encoding='utf-8') as log_file:
-    log_file.write("\n" + "="*70 + "\n")
-    log_file.write("📊 COLLECTION COMPLETE\n")
-    log_file.write("="*70 + "\n")
-    log_file.write(f"\n✅ Successfully collected: {len(collected_users)} users\n")
-    log_file.write(f"📊 Candidates checked: {candidates_checked}\n")
-    log_file.write(f"❌ Candidates rejected: {candidates_rejected}\n")
-    log_file.write(f"✓ Success rate: {len(collected_users)/max(candidates_checked,1)*100:.1f}%\n")
-
-    if collected_users:
-        log_file.write(f"\n📈 Dataset Statistics:\n")
-        log_file.write(f"   Total posts collected: {total_posts}\n")
-        log_file.write(f"   Average posts per user: {avg_posts:.1f}\n")
-        log_file.write(f"   Average sentiment: {avg_sentiment:.3f}\n")
-        log_file.write(f"   Average MH subreddit participation: {avg_mh_participation:.1%}\n")
-        log_file.write(f"\n⏱️ Collection Time Statistics:\n")
-        log_file.write(f"   Total time: {hours}h {minutes}m {seconds}s\n")
-        log_file.write(f"   Average time per user: {total_time/len(collected_users):.1f} seconds\n")
-        log_file.write(f"   Posts collected per hour: {(total_posts/(total_time/3600)):.1f}\n")
-        
-        # Cold start statistics
-        cold_start_users = sum(1 for u in collected_users 
-                              if u['cold_start_metadata']['cold_start_phase'] == 'cold_start')
-        transition_users = sum(1 for u in collected_users 
-                              if u['cold_start_metadata']['cold_start_phase'] == 'transition')
-        full_users = sum(1 for u in collected_users 
-                        if u['cold_start_metadata']['cold_start_phase'] == 'fully_personalized')
-        avg_confidence = sum(u['cold_start_metadata']['confidence_score'] 
-                            for u in collected_users) / len(collected_users)
-        avg_stability = sum(u['cold_start_metadata']['baseline_stability'] 
-                           for u in collected_users) / len(collected_users)
-        suitable_for_cold_start = sum(1 for u in collected_users 
-                                      if u['cold_start_metadata']['suitable_for_cold_start_testing'])
-        suitable_for_baseline = sum(1 for u in collected_users 
-                                   if u['cold_start_metadata']['suitable_for_baseline_testing'])
-        
-        log_file.write(f"\n🔬 Cold Start Analysis Statistics:\n")
-        log_file.write(f"   Cold start users (5-15 posts): {cold_start_users}\n")
-        log_file.write(f"   Transition users (16-30 posts): {transition_users}\n")
-        log_file.write(f"   Fully personalized users (31+ posts): {full_users}\n")
-        log_file.write(f"   Average confidence score: {avg_confidence:.3f}\n")
-        log_file.write(f"   Average baseline stability: {avg_stability:.3f}\n")
-        log_file.write(f"   Users suitable for cold start testing: {suitable_for_cold_start}\n")
-        log_file.write(f"   Users suitable for baseline testing: {suitable_for_baseline}\n")
-    else:
-        log_file.write("\nNo users were collected.\n")
+    log_file.writelines(log_lines)
 
-print(f"\n✨ Done!\n")
\ No newline at end of file
+print(f"\n✨ Done!\n")